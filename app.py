@@ -1,12 +1,157 @@
-from openai import OpenAI
+from openai import (OpenAI, AsyncOpenAI,
+                    APIConnectionError, APITimeoutError, RateLimitError)
+import asyncio
+import httpx
+import functools
+import hashlib
+from dataclasses import dataclass
 import os
+import random
+import re
+import time
 from typing import Optional, Dict, Any
 from dotenv import load_dotenv
-from prompt import PromptGenerator
+from prompt import PROMPT_GEN
+
+# Optional: Aho-Corasick automaton for single-pass keyword scanning
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Optional: numpy underpins both the pandas and numba batch paths, and may
+# be present without either of them (or with only one)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Optional: vectorized batch sentiment classification
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+# Optional: JIT-compiled keyword scanning for very large batches
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Sentiment category ids used by the JIT scanner; lower id = higher priority,
+# 0 means no category matched
+_SENTIMENT_BY_ID = ('neutral', 'struggling', 'positive', 'questioning')
+
+if numba is not None and np is not None:
+    @numba.njit(parallel=True, cache=True)
+    def _scan_comments(buf, offsets, kw_buf, kw_offsets, kw_cats):
+        """
+        Classify many lowercased utf-8 comments against a flattened keyword
+        table in one parallel pass, returning a category id per comment.
+        """
+        out = np.zeros(len(offsets) - 1, dtype=np.int8)
+        for ci in numba.prange(len(offsets) - 1):
+            start = offsets[ci]
+            end = offsets[ci + 1]
+            best = np.int8(0)
+            for ki in range(len(kw_offsets) - 1):
+                cat = kw_cats[ki]
+                if best != 0 and cat >= best:
+                    continue
+                ks = kw_offsets[ki]
+                klen = kw_offsets[ki + 1] - ks
+                for pos in range(start, end - klen + 1):
+                    hit = True
+                    for j in range(klen):
+                        if buf[pos + j] != kw_buf[ks + j]:
+                            hit = False
+                            break
+                    if not hit:
+                        continue
+                    # Word boundaries, as in the regex path
+                    before = buf[pos - 1] if pos > start else 0
+                    after = buf[pos + klen] if pos + klen < end else 0
+                    if ((48 <= before <= 57) or (97 <= before <= 122) or before == 95
+                            or (48 <= after <= 57) or (97 <= after <= 122) or after == 95):
+                        continue
+                    best = cat
+                    break
+            out[ci] = best
+        return out
 
 # Load environment variables from .env file
 load_dotenv()
 
+@dataclass(frozen=True)
+class Config:
+    """Immutable snapshot of the OpenAI configuration from the environment."""
+    api_key: Optional[str]
+    model: str
+    max_tokens: int
+    temperature: float
+    top_p: float
+
+@functools.lru_cache(maxsize=1)
+def _get_config() -> Config:
+    """Parse the environment once and reuse the result for every instance."""
+    return Config(
+        api_key=os.getenv('OPENAI_API_KEY'),
+        model=os.getenv('OPENAI_MODEL', 'gpt-4o-mini'),
+        max_tokens=int(os.getenv('MAX_TOKENS', '300')),
+        temperature=float(os.getenv('TEMPERATURE', '0.7')),
+        top_p=float(os.getenv('TOP_P', '0.9')),
+    )
+
+# Shared system message for all reply generation calls
+SYSTEM_PROMPT = "You are a compassionate spiritual guide who responds to comments with empathy, wisdom, and grace. Your responses should be authentic, humble, and grounded in spiritual truth."
+
+def backoff(max_attempts: int = 3, base: float = 1.0, factor: float = 2.0,
+            jitter: bool = True,
+            retry_on: tuple = (RateLimitError, APIConnectionError, APITimeoutError)):
+    """
+    Retry a sync or async callable with exponential backoff on transient API
+    errors.
+
+    Permanent failures (bad requests, invalid keys, etc.) are not retried and
+    propagate immediately.
+
+    Args:
+        max_attempts: Total number of attempts before giving up
+        base: Initial delay in seconds
+        factor: Multiplier applied to the delay after each attempt
+        jitter: Add a random 0-1s offset to each delay to avoid thundering herds
+        retry_on: Exception types that are considered transient
+    """
+    def _delay(attempt: int) -> float:
+        delay = base * factor ** attempt
+        if jitter:
+            delay += random.random()
+        return delay
+
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                for attempt in range(max_attempts):
+                    try:
+                        return await func(*args, **kwargs)
+                    except retry_on:
+                        if attempt == max_attempts - 1:
+                            raise
+                        await asyncio.sleep(_delay(attempt))
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                for attempt in range(max_attempts):
+                    try:
+                        return func(*args, **kwargs)
+                    except retry_on:
+                        if attempt == max_attempts - 1:
+                            raise
+                        time.sleep(_delay(attempt))
+        return wrapper
+    return decorator
+
 class CommentReplyAI:
     def __init__(self, api_key: Optional[str] = None):
         """
@@ -15,20 +160,246 @@ class CommentReplyAI:
         Args:
             api_key: OpenAI API key. If None, will try to get from environment variable.
         """
-        self.api_key = api_key or os.getenv('OPENAI_API_KEY')
+        config = _get_config()
+        self.api_key = api_key or config.api_key
         if not self.api_key:
             raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY in .env file or pass api_key parameter.")
+
+        # Configuration is parsed from the environment once and cached
+        self.model = config.model
+        self.max_tokens = config.max_tokens
+        self.temperature = config.temperature
+        self.top_p = config.top_p
         
-        # Get configuration from environment variables
-        self.model = os.getenv('OPENAI_MODEL', 'gpt-4')
-        self.max_tokens = int(os.getenv('MAX_TOKENS', '300'))
-        self.temperature = float(os.getenv('TEMPERATURE', '0.7'))
-        self.top_p = float(os.getenv('TOP_P', '0.9'))
-        
-        # Initialize OpenAI client
-        self.client = OpenAI(api_key=self.api_key)
-        self.prompt_generator = PromptGenerator()
-        
+        # Initialize the synchronous OpenAI client, used by generate_reply.
+        # The async client is built lazily per event loop (see _get_aclient):
+        # its keepalive connections are bound to the loop they were opened on,
+        # so sharing one client across asyncio.run boundaries replays requests
+        # on dead connections.
+        # max_retries=0: the backoff() decorator owns the retry policy, and
+        # the SDK default of 2 would stack its own schedule on top
+        self.client = OpenAI(api_key=self.api_key, max_retries=0)
+        self._aclient = None
+        self._aclient_loop = None
+        self.prompt_generator = PROMPT_GEN
+
+        # Sentiment keyword sets, listed in classification priority order
+        # (struggling > positive > questioning)
+        # Inflections are listed explicitly since the word-bounded patterns no
+        # longer match them as substrings of the base form, and the automaton
+        # and JIT paths need literal words anyway
+        self._sentiment_keywords = {
+            'struggling': ['struggle', 'struggles', 'struggled', 'struggling',
+                           'hard', 'difficult', 'difficulty', 'difficulties',
+                           'doubt', 'doubts', 'doubted', 'doubting', 'lost',
+                           'confused', 'hurt', 'hurts', 'hurting', 'pain', 'pains',
+                           'pained', 'painful', 'afraid', 'scared', 'worried'],
+            'positive': ['thank', 'thanks', 'thankful', 'grateful', 'amazing',
+                         'blessed', 'love', 'loves', 'loved', 'wonderful', 'beautiful',
+                         'inspiring', 'helped', 'encouraging'],
+            'questioning': ['why', 'how', 'what', 'when', 'where', 'understand',
+                            'understanding', 'explain', 'explained', 'explaining',
+                            'confused', 'unclear', 'question', 'questions',
+                            'questioning', 'questioned'],
+        }
+
+        # Compile each keyword set into one regex alternation so sentiment
+        # analysis is a single C-level scan per category instead of a Python
+        # loop of substring checks. Word boundaries also stop partial matches
+        # like 'hardship' triggering on 'hard'.
+        self._re_struggling = self._compile_keywords(self._sentiment_keywords['struggling'])
+        self._re_positive = self._compile_keywords(self._sentiment_keywords['positive'])
+        self._re_questioning = self._compile_keywords(self._sentiment_keywords['questioning'])
+
+        # When pyahocorasick is available, build one automaton over all
+        # keywords so classification is a single O(len(comment)) pass instead
+        # of one scan per category. Keywords can belong to several categories
+        # (e.g. 'confused'), and add_word overwrites repeated keys, so the
+        # categories are accumulated per keyword first.
+        self._ac = None
+        if ahocorasick is not None:
+            keyword_categories: Dict[str, set] = {}
+            for category, keywords in self._sentiment_keywords.items():
+                for keyword in keywords:
+                    keyword_categories.setdefault(keyword, set()).add(category)
+            self._ac = ahocorasick.Automaton()
+            for keyword, categories in keyword_categories.items():
+                self._ac.add_word(keyword, (keyword, categories))
+            self._ac.make_automaton()
+
+        # Flattened keyword table (blob + offsets + category ids) for the
+        # JIT scanner, in the same priority order as _SENTIMENT_BY_ID
+        self._kw_table = None
+        if numba is not None and np is not None:
+            kw_blob, kw_offsets, kw_cats = bytearray(), [0], []
+            for cat_id, category in enumerate(('struggling', 'positive', 'questioning'), start=1):
+                for keyword in self._sentiment_keywords[category]:
+                    kw_blob.extend(keyword.encode())
+                    kw_offsets.append(len(kw_blob))
+                    kw_cats.append(cat_id)
+            self._kw_table = (np.frombuffer(bytes(kw_blob), dtype=np.uint8),
+                              np.array(kw_offsets, dtype=np.int64),
+                              np.array(kw_cats, dtype=np.int8))
+
+        # Cache identical (comment, tone, model) requests so repeats skip the
+        # API round-trip entirely. Only enabled at low temperature (or via
+        # CACHE_REPLIES=1) since sampling at high temperature is expected to
+        # vary between calls.
+        self._reply_cache: Dict[tuple, Dict[str, Any]] = {}
+        self._reply_cache_maxsize = 1024
+        self.cache_replies = (self.temperature <= 0.3
+                              or os.getenv('CACHE_REPLIES', '0') == '1')
+
+        # Proactive rate limiting so concurrent batches don't trip OpenAI's
+        # RPM/TPM limits and burn time in 429 retries
+        self.max_concurrency = int(os.getenv('OPENAI_MAX_CONCURRENCY', '20'))
+        self.max_requests_per_minute = float(os.getenv('MAX_REQUESTS_PER_MINUTE', '500'))
+        self.max_tokens_per_minute = float(os.getenv('MAX_TOKENS_PER_MINUTE', '90000'))
+        self._sem = None
+        self._sem_loop = None
+        self._request_budget = self.max_requests_per_minute
+        self._token_budget = self.max_tokens_per_minute
+        self._last_refill = time.monotonic()
+
+        # Single-flight: concurrent calls with an identical prompt share one
+        # in-flight API request instead of firing duplicates
+        self._inflight: Dict[str, tuple] = {}
+
+    @staticmethod
+    def _supports_prompt_list(model: str) -> bool:
+        """
+        Check whether a model is served by the legacy completions endpoint,
+        which accepts a list of prompts in a single request.
+        """
+        return (model.endswith('-instruct')
+                or model in ('davinci-002', 'babbage-002'))
+
+    @staticmethod
+    def _compile_keywords(keywords: list) -> re.Pattern:
+        """Compile a keyword list into a single word-bounded regex alternation."""
+        return re.compile(r'\b(?:' + '|'.join(map(re.escape, keywords)) + r')\b',
+                          re.IGNORECASE)
+
+    def _get_aclient(self) -> AsyncOpenAI:
+        """
+        Get the async client for the running event loop, rebuilding it if the
+        loop changed.
+
+        Each asyncio.run entry point (the batch wrapper, Streamlit streaming)
+        runs on a fresh loop; a client carried over from a closed loop would
+        write to stale keepalive connections and fail. The HTTP/2 pool still
+        multiplexes all concurrent requests within one loop. The previous
+        loop's client is simply dropped; its sockets are reclaimed on GC.
+        """
+        loop = asyncio.get_running_loop()
+        if self._aclient is None or self._aclient_loop is not loop:
+            self._aclient = AsyncOpenAI(
+                api_key=self.api_key,
+                max_retries=0,
+                http_client=httpx.AsyncClient(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=100)
+                )
+            )
+            self._aclient_loop = loop
+        return self._aclient
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the concurrency semaphore, rebuilding it if the event loop changed."""
+        loop = asyncio.get_running_loop()
+        if self._sem is None or self._sem_loop is not loop:
+            self._sem = asyncio.Semaphore(self.max_concurrency)
+            self._sem_loop = loop
+        return self._sem
+
+    async def _wait_for_tokens(self, tokens_needed: int) -> None:
+        """
+        Block until the rolling RPM/TPM budget can cover one more request.
+
+        The budgets refill continuously based on elapsed time, so throughput
+        stays smooth instead of bursting at minute boundaries.
+
+        Args:
+            tokens_needed: Estimated token cost of the upcoming request
+        """
+        # A request costing more than a full minute's budget could never be
+        # granted; charge the whole budget and let it proceed
+        tokens_needed = min(tokens_needed, self.max_tokens_per_minute)
+        while True:
+            now = time.monotonic()
+            elapsed = now - self._last_refill
+            self._last_refill = now
+            self._request_budget = min(
+                self._request_budget + self.max_requests_per_minute * elapsed / 60.0,
+                self.max_requests_per_minute
+            )
+            self._token_budget = min(
+                self._token_budget + self.max_tokens_per_minute * elapsed / 60.0,
+                self.max_tokens_per_minute
+            )
+            if self._request_budget >= 1 and self._token_budget >= tokens_needed:
+                self._request_budget -= 1
+                self._token_budget -= tokens_needed
+                return
+            await asyncio.sleep(0.1)
+
+    @backoff()
+    async def _create_chat_completion(self, **kwargs):
+        """Issue a chat completion, retrying transient failures with backoff."""
+        return await self._get_aclient().chat.completions.create(**kwargs)
+
+    @backoff()
+    def _create_chat_completion_sync(self, **kwargs):
+        """Sync counterpart of _create_chat_completion, on the sync client."""
+        return self.client.chat.completions.create(**kwargs)
+
+    @backoff()
+    async def _create_completion(self, **kwargs):
+        """Issue a legacy completions request, retrying transient failures."""
+        return await self._get_aclient().completions.create(**kwargs)
+
+    def _cache_put(self, cache_key: tuple, result: Dict[str, Any]) -> None:
+        """Cache a successful reply, evicting the oldest entry once full."""
+        if len(self._reply_cache) >= self._reply_cache_maxsize:
+            self._reply_cache.pop(next(iter(self._reply_cache)))
+        self._reply_cache[cache_key] = dict(result)
+
+    async def _single_flight_completion(self, prompt: str, **kwargs):
+        """
+        Issue a chat completion, coalescing concurrent duplicates.
+
+        If another task on the same event loop is already awaiting an
+        identical prompt, await its result instead of firing a second API
+        call.
+
+        Args:
+            prompt: The full user prompt (used to key in-flight requests)
+            **kwargs: Arguments forwarded to chat.completions.create
+        """
+        key = hashlib.blake2b(
+            f"{kwargs.get('model')}|{prompt}".encode(), digest_size=16
+        ).hexdigest()
+        loop = asyncio.get_running_loop()
+
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight[0] is loop and not inflight[1].done():
+            return await inflight[1]
+
+        future = loop.create_future()
+        self._inflight[key] = (loop, future)
+        try:
+            async with self._get_semaphore():
+                await self._wait_for_tokens(self.max_tokens + len(prompt) // 4)
+                response = await self._create_chat_completion(**kwargs)
+            future.set_result(response)
+            return response
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved in case no one else is waiting
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
     def analyze_comment_sentiment(self, comment: str) -> str:
         """
         Analyze the sentiment of a comment to determine appropriate tone.
@@ -39,29 +410,88 @@ class CommentReplyAI:
         Returns:
             str: Detected sentiment ('positive', 'negative', 'neutral', 'struggling', 'questioning')
         """
-        comment_lower = comment.lower()
-        
-        # Struggling/difficult emotions
-        struggling_keywords = ['struggle', 'struggling', 'hard', 'difficult', 'doubt', 'doubting', 
-                              'lost', 'confused', 'hurt', 'pain', 'afraid', 'scared', 'worried']
-        
-        # Positive/grateful emotions
-        positive_keywords = ['thank', 'grateful', 'amazing', 'blessed', 'love', 'wonderful', 
-                            'beautiful', 'inspiring', 'helped', 'encouraging']
-        
-        # Questioning/seeking
-        questioning_keywords = ['why', 'how', 'what', 'when', 'where', 'understand', 'explain', 
-                               'confused', 'unclear', 'question']
-        
-        if any(keyword in comment_lower for keyword in struggling_keywords):
+        if self._ac is not None:
+            comment_lower = comment.lower()
+            found = set()
+            for end, (keyword, categories) in self._ac.iter(comment_lower):
+                # Enforce the same word boundaries as the regex path
+                start = end - len(keyword) + 1
+                if start > 0 and comment_lower[start - 1].isalnum():
+                    continue
+                if end + 1 < len(comment_lower) and comment_lower[end + 1].isalnum():
+                    continue
+                found.update(categories)
+            for category in ('struggling', 'positive', 'questioning'):
+                if category in found:
+                    return category
+            return 'neutral'
+
+        if self._re_struggling.search(comment):
             return 'struggling'
-        elif any(keyword in comment_lower for keyword in positive_keywords):
+        elif self._re_positive.search(comment):
             return 'positive'
-        elif any(keyword in comment_lower for keyword in questioning_keywords):
+        elif self._re_questioning.search(comment):
             return 'questioning'
         else:
             return 'neutral'
     
+    def _batch_classify(self, comments: list) -> list:
+        """
+        Classify the sentiment of many comments at once.
+
+        When pandas is available the keyword scans run vectorized in C over
+        the whole batch instead of one Python call per comment, which pays
+        off for large batches.
+
+        Args:
+            comments: List of comment strings
+
+        Returns:
+            List of sentiment labels, one per comment
+        """
+        # Very large batches go through the JIT scanner, which parallelizes
+        # across cores; the compile cost isn't worth it below this size
+        if self._kw_table is not None and len(comments) >= 1024:
+            return self._classify_many_jit(comments)
+
+        if pd is None:
+            return [self.analyze_comment_sentiment(comment) for comment in comments]
+
+        s = pd.Series(comments, dtype=object).str.lower()
+        struggling_mask = s.str.contains(self._re_struggling, regex=True)
+        positive_mask = s.str.contains(self._re_positive, regex=True)
+        questioning_mask = s.str.contains(self._re_questioning, regex=True)
+
+        return np.select(
+            [struggling_mask, positive_mask, questioning_mask],
+            ['struggling', 'positive', 'questioning'],
+            default='neutral'
+        ).tolist()
+
+    def _classify_many_jit(self, comments: list) -> list:
+        """
+        Classify a batch with the numba-compiled scanner.
+
+        Comments are packed into one contiguous byte buffer so the kernel can
+        prange across them without touching Python objects.
+
+        Args:
+            comments: List of comment strings
+
+        Returns:
+            List of sentiment labels, one per comment
+        """
+        buf, offsets = bytearray(), [0]
+        for comment in comments:
+            buf.extend(comment.lower().encode())
+            offsets.append(len(buf))
+        category_ids = _scan_comments(
+            np.frombuffer(bytes(buf), dtype=np.uint8),
+            np.array(offsets, dtype=np.int64),
+            *self._kw_table
+        )
+        return [_SENTIMENT_BY_ID[i] for i in category_ids]
+
     def determine_tone(self, sentiment: str) -> str:
         """
         Determine the appropriate tone based on comment sentiment.
@@ -80,52 +510,138 @@ class CommentReplyAI:
         }
         return tone_mapping.get(sentiment, 'inviting')
     
-    def generate_reply(self, comment: str, custom_tone: Optional[str] = None, 
+    async def agenerate_reply(self, comment: str, custom_tone: Optional[str] = None,
+                             model: Optional[str] = None,
+                             sentiment: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Generate an AI reply to a user comment (async version).
+
+        Args:
+            comment: The user's comment to reply to
+            custom_tone: Optional custom tone override
+            model: Optional model override (uses .env OPENAI_MODEL if not specified)
+            sentiment: Optional precomputed sentiment (skips per-comment analysis)
+
+        Returns:
+            Dict containing the reply, tone used, and sentiment detected
+        """
+        try:
+            # Use model from .env if not specified
+            model = model or self.model
+
+            # Serve repeats straight from the cache
+            cache_key = (comment, custom_tone, model)
+            if self.cache_replies and cache_key in self._reply_cache:
+                return dict(self._reply_cache[cache_key])
+
+            # Analyze sentiment (unless precomputed) and determine tone
+            sentiment = sentiment or self.analyze_comment_sentiment(comment)
+            tone = custom_tone or self.determine_tone(sentiment)
+
+            # Generate appropriate prompt
+            prompt = self.prompt_generator.create_prompt(comment, tone)
+
+            # Call OpenAI API with configuration from .env; throttling and
+            # duplicate coalescing happen inside _single_flight_completion
+            response = await self._single_flight_completion(
+                prompt,
+                model=model,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=self.max_tokens,
+                temperature=self.temperature,
+                top_p=self.top_p
+            )
+
+            ai_reply = response.choices[0].message.content.strip()
+
+            result = {
+                'reply': ai_reply,
+                'tone_used': tone,
+                'sentiment_detected': sentiment,
+                'success': True,
+                'error': None
+            }
+
+            # Cache successful replies only
+            if self.cache_replies:
+                self._cache_put(cache_key, result)
+
+            return result
+
+        except Exception as e:
+            return {
+                'reply': None,
+                'tone_used': tone if 'tone' in locals() else None,
+                'sentiment_detected': sentiment if 'sentiment' in locals() else None,
+                'success': False,
+                'error': str(e)
+            }
+
+    def generate_reply(self, comment: str, custom_tone: Optional[str] = None,
                       model: Optional[str] = None) -> Dict[str, Any]:
         """
         Generate an AI reply to a user comment.
-        
+
+        Runs on the synchronous client rather than wrapping agenerate_reply:
+        spinning up a throwaway event loop per call would leave the async
+        client's keepalive connections bound to a closed loop and silently
+        re-send requests on reconnect.
+
         Args:
             comment: The user's comment to reply to
             custom_tone: Optional custom tone override
             model: Optional model override (uses .env OPENAI_MODEL if not specified)
-            
+
         Returns:
             Dict containing the reply, tone used, and sentiment detected
         """
         try:
             # Use model from .env if not specified
             model = model or self.model
-            
+
+            # Serve repeats straight from the cache
+            cache_key = (comment, custom_tone, model)
+            if self.cache_replies and cache_key in self._reply_cache:
+                return dict(self._reply_cache[cache_key])
+
             # Analyze sentiment and determine tone
             sentiment = self.analyze_comment_sentiment(comment)
             tone = custom_tone or self.determine_tone(sentiment)
-            
+
             # Generate appropriate prompt
             prompt = self.prompt_generator.create_prompt(comment, tone)
-            
+
             # Call OpenAI API with configuration from .env
-            response = self.client.chat.completions.create(
+            response = self._create_chat_completion_sync(
                 model=model,
                 messages=[
-                    {"role": "system", "content": "You are a compassionate spiritual guide who responds to comments with empathy, wisdom, and grace. Your responses should be authentic, humble, and grounded in spiritual truth."},
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 max_tokens=self.max_tokens,
                 temperature=self.temperature,
                 top_p=self.top_p
             )
-            
+
             ai_reply = response.choices[0].message.content.strip()
-            
-            return {
+
+            result = {
                 'reply': ai_reply,
                 'tone_used': tone,
                 'sentiment_detected': sentiment,
                 'success': True,
                 'error': None
             }
-            
+
+            # Cache successful replies only
+            if self.cache_replies:
+                self._cache_put(cache_key, result)
+
+            return result
+
         except Exception as e:
             return {
                 'reply': None,
@@ -134,41 +650,175 @@ class CommentReplyAI:
                 'success': False,
                 'error': str(e)
             }
-    
+
+    async def stream_reply(self, comment: str, custom_tone: Optional[str] = None,
+                           model: Optional[str] = None):
+        """
+        Generate an AI reply and yield it token by token as it arrives.
+
+        Lets callers show output within the first few hundred milliseconds
+        instead of blocking until the full response is generated.
+
+        Args:
+            comment: The user's comment to reply to
+            custom_tone: Optional custom tone override
+            model: Optional model override (uses .env OPENAI_MODEL if not specified)
+
+        Yields:
+            str: The next chunk of the reply text
+        """
+        model = model or self.model
+        sentiment = self.analyze_comment_sentiment(comment)
+        tone = custom_tone or self.determine_tone(sentiment)
+        prompt = self.prompt_generator.create_prompt(comment, tone)
+        estimated_tokens = self.max_tokens + len(prompt) // 4
+
+        async with self._get_semaphore():
+            await self._wait_for_tokens(estimated_tokens)
+            response = await self._get_aclient().chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=self.max_tokens,
+                temperature=self.temperature,
+                top_p=self.top_p,
+                stream=True
+            )
+            async for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
     def batch_generate_replies(self, comments: list, custom_tones: Optional[Dict[int, str]] = None) -> list:
         """
         Generate replies for multiple comments at once.
-        
+
+        Requests are issued concurrently, so wall-clock time is roughly one
+        round-trip instead of one per comment.
+
         Args:
             comments: List of comment strings
             custom_tones: Optional dictionary mapping comment index to custom tone
-            
+
         Returns:
-            List of reply dictionaries
+            List of reply dictionaries (in the same order as the input comments)
         """
-        results = []
         custom_tones = custom_tones or {}
-        
-        for i, comment in enumerate(comments):
-            custom_tone = custom_tones.get(i)
-            result = self.generate_reply(comment, custom_tone)
-            results.append(result)
-            
+
+        async def _run():
+            # Classify the whole batch up front in one vectorized pass, in a
+            # worker thread so the CPU work doesn't stall the event loop
+            sentiments = await asyncio.to_thread(self._batch_classify, comments)
+
+            # Legacy completions models accept a list of prompts per request,
+            # so the whole batch collapses to one request per tone group and
+            # RPM is amortized across the batch. Chat models don't support
+            # prompt lists, so they take the concurrent per-comment path.
+            if self._supports_prompt_list(self.model):
+                return await self._batch_via_prompt_list(
+                    comments, custom_tones, sentiments)
+
+            tasks = [self.agenerate_reply(comment, custom_tones.get(i),
+                                          sentiment=sentiments[i])
+                     for i, comment in enumerate(comments)]
+            return await asyncio.gather(*tasks)
+
+        return asyncio.run(_run())
+
+    async def _batch_via_prompt_list(self, comments: list,
+                                     custom_tones: Dict[int, str],
+                                     sentiments: list) -> list:
+        """
+        Batch replies through the legacy completions endpoint.
+
+        Comments are grouped by tone and each group is sent as a single
+        multi-prompt request; choice indices map replies back to their
+        original positions.
+
+        Args:
+            comments: List of comment strings
+            custom_tones: Dictionary mapping comment index to custom tone
+            sentiments: Precomputed sentiment per comment
+
+        Returns:
+            List of reply dictionaries (in the same order as the input comments)
+        """
+        results = [None] * len(comments)
+
+        # Group comment indices by the tone their prompt will use
+        groups: Dict[str, list] = {}
+        for i in range(len(comments)):
+            tone = custom_tones.get(i) or self.determine_tone(sentiments[i])
+            groups.setdefault(tone, []).append(i)
+
+        async def _run_group(tone: str, indices: list, prompts: list):
+            estimated_tokens = (self.max_tokens * len(prompts)
+                                + sum(len(p) // 4 for p in prompts))
+            try:
+                async with self._get_semaphore():
+                    await self._wait_for_tokens(estimated_tokens)
+                    response = await self._create_completion(
+                        model=self.model,
+                        prompt=prompts,
+                        max_tokens=self.max_tokens,
+                        temperature=self.temperature,
+                        top_p=self.top_p
+                    )
+                for choice in response.choices:
+                    i = indices[choice.index]
+                    results[i] = {
+                        'reply': choice.text.strip(),
+                        'tone_used': tone,
+                        'sentiment_detected': sentiments[i],
+                        'success': True,
+                        'error': None
+                    }
+            except Exception as e:
+                for i in indices:
+                    results[i] = {
+                        'reply': None,
+                        'tone_used': tone,
+                        'sentiment_detected': sentiments[i],
+                        'success': False,
+                        'error': str(e)
+                    }
+
+        # Split each tone group so no single request's estimated cost exceeds
+        # the per-minute token budget, which _wait_for_tokens could never grant
+        tasks = []
+        for tone, indices in groups.items():
+            prompts = [self.prompt_generator.create_prompt(comments[i], tone)
+                       for i in indices]
+            start, cost = 0, 0.0
+            for k, prompt in enumerate(prompts):
+                prompt_cost = self.max_tokens + len(prompt) // 4
+                if k > start and cost + prompt_cost > self.max_tokens_per_minute:
+                    tasks.append(_run_group(tone, indices[start:k], prompts[start:k]))
+                    start, cost = k, 0.0
+                cost += prompt_cost
+            tasks.append(_run_group(tone, indices[start:], prompts[start:]))
+
+        await asyncio.gather(*tasks)
         return results
 
+@functools.lru_cache(maxsize=4)
+def _get_ai_system(api_key: Optional[str] = None) -> CommentReplyAI:
+    """Cache one CommentReplyAI (and its OpenAI clients) per API key."""
+    return CommentReplyAI(api_key)
+
 # Convenience function for backend integration
-def generate_comment_reply(comment: str, api_key: Optional[str] = None, 
+def generate_comment_reply(comment: str, api_key: Optional[str] = None,
                           tone: Optional[str] = None) -> Dict[str, Any]:
     """
     Convenience function to generate a single reply.
-    
+
     Args:
         comment: The user's comment
         api_key: OpenAI API key
         tone: Optional custom tone
-        
+
     Returns:
         Dictionary with reply and metadata
     """
-    ai_system = CommentReplyAI(api_key)
-    return ai_system.generate_reply(comment, tone)
\ No newline at end of file
+    return _get_ai_system(api_key).generate_reply(comment, tone)
\ No newline at end of file
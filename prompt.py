@@ -1,54 +1,96 @@
+# Tone guidelines and examples are module-level constants so every
+# PromptGenerator (and every Streamlit rerun) shares one copy instead of
+# rebuilding the dicts per instance or per call.
+TONE_GUIDELINES = {
+    'empathetic': {
+        'description': 'Compassionate and acknowledges the emotion behind the comment',
+        'style': 'gentle, understanding, validating feelings',
+        'focus': 'emotional support and spiritual comfort'
+    },
+    'biblical': {
+        'description': 'Rooted in spiritual truth without being overly formal',
+        'style': 'wise, grounded in faith, thoughtful',
+        'focus': 'spiritual guidance and biblical wisdom'
+    },
+    'inviting': {
+        'description': 'Leaves space for dialogue and reflection',
+        'style': 'open-ended, encouraging conversation',
+        'focus': 'fostering connection and continued dialogue'
+    },
+    'humble': {
+        'description': 'Points back to God and comes from a place of grace',
+        'style': 'modest, grateful, God-centered',
+        'focus': 'deflecting praise to God and expressing gratitude'
+    },
+    'witty': {
+        'description': 'Light, faith-filled humor when appropriate',
+        'style': 'gentle humor, joy-filled, lighthearted',
+        'focus': 'bringing joy while maintaining spiritual depth'
+    }
+}
+
+TONE_EXAMPLES = {
+    'empathetic': {
+        'comment': "I'm struggling to believe this applies to me.",
+        'reply': "I hear the struggle in your words, and that's so understandable. Sometimes the most profound truths feel the hardest to accept for ourselves. You're not alone in feeling this way. ❤️"
+    },
+    'biblical': {
+        'comment': "I don't understand why this keeps happening to me.",
+        'reply': "Those 'why' questions can feel so heavy, can't they? Sometimes our greatest growth comes through seasons we never would have chosen. His plans often unfold in ways we can't see in the moment."
+    },
+    'inviting': {
+        'comment': "This really made me think.",
+        'reply': "I love when something sparks that kind of reflection! What part resonated most with you? I'd be curious to hear what thoughts it stirred up."
+    },
+    'humble': {
+        'comment': "Thank you so much for sharing this wisdom!",
+        'reply': "You're so kind! Any wisdom here isn't mine - I'm just grateful when something resonates and encourages someone's heart. That's all God's grace at work. 🙏"
+    },
+    'witty': {
+        'comment': "I needed to hear this today!",
+        'reply': "Isn't it amazing how the right words show up exactly when we need them? Someone upstairs has pretty good timing! 😊 Hope it brings some light to your day."
+    }
+}
+
+# Terse per-tone reply instructions; prompt tokens cost latency and money,
+# so these stay single sentences rather than bulleted blocks
+TONE_INSTRUCTIONS = {
+    'empathetic': "The commenter is struggling: acknowledge their feelings without trying to fix everything, and offer gentle spiritual encouragement.",
+    'biblical': "The commenter is seeking understanding: offer thoughtful spiritual wisdom grounded in faith, referencing spiritual principles naturally (no forced Bible verses).",
+    'inviting': "Encourage continued reflection: ask a gentle follow-up question and leave space for dialogue.",
+    'humble': "The commenter is positive or grateful: deflect praise to God, express gratitude, and stay modest about your own role.",
+    'witty': "Bring lightness with gentle, faith-filled humor while staying respectful and spiritually grounded.",
+}
+
+BASE_INSTRUCTIONS = (
+    "Be authentic, personal, compassionate, humble, and conversational; "
+    "spiritually grounded but not preachy. "
+    "No sales language, religious jargon, dismissed feelings, unsolicited "
+    "advice, or generic phrases like 'Thank you for sharing'."
+)
+
 class PromptGenerator:
     """
     Generates customized prompts for AI responses based on comment tone and content.
     Ensures replies are empathetic, spiritual, and tone-matched.
+
+    All state is shared at class level, so instances are interchangeable;
+    prefer the module-level PROMPT_GEN singleton over constructing new ones.
     """
     
+    tone_guidelines = TONE_GUIDELINES
+    base_instructions = BASE_INSTRUCTIONS
+    _tones_tuple = tuple(TONE_GUIDELINES)
+    _prompt_templates = None
+    
     def __init__(self):
-        self.tone_guidelines = {
-            'empathetic': {
-                'description': 'Compassionate and acknowledges the emotion behind the comment',
-                'style': 'gentle, understanding, validating feelings',
-                'focus': 'emotional support and spiritual comfort'
-            },
-            'biblical': {
-                'description': 'Rooted in spiritual truth without being overly formal',
-                'style': 'wise, grounded in faith, thoughtful',
-                'focus': 'spiritual guidance and biblical wisdom'
-            },
-            'inviting': {
-                'description': 'Leaves space for dialogue and reflection',
-                'style': 'open-ended, encouraging conversation',
-                'focus': 'fostering connection and continued dialogue'
-            },
-            'humble': {
-                'description': 'Points back to God and comes from a place of grace',
-                'style': 'modest, grateful, God-centered',
-                'focus': 'deflecting praise to God and expressing gratitude'
-            },
-            'witty': {
-                'description': 'Light, faith-filled humor when appropriate',
-                'style': 'gentle humor, joy-filled, lighthearted',
-                'focus': 'bringing joy while maintaining spiritual depth'
+        # Precompute the full prompt template for each tone once per process,
+        # leaving only the {comment} placeholder to fill per call
+        if PromptGenerator._prompt_templates is None:
+            PromptGenerator._prompt_templates = {
+                tone: self._build_prompt_template(tone)
+                for tone in self.tone_guidelines
             }
-        }
-        
-        self.base_instructions = """
-        Your response should be:
-        - Authentic and personal, not generic or robotic
-        - Spiritually grounded but not preachy
-        - Compassionate and understanding
-        - Humble and gracious
-        - 2-3 sentences maximum
-        - Written in a conversational, warm tone
-        
-        Avoid:
-        - Sales language or promotional content
-        - Being overly formal or religious jargon
-        - Dismissing or minimizing feelings
-        - Giving unsolicited advice unless clearly requested
-        - Generic phrases like "Thank you for sharing"
-        """
     
     def create_prompt(self, comment: str, tone: str) -> str:
         """
@@ -61,71 +103,30 @@ class PromptGenerator:
         Returns:
             str: A complete prompt for the AI to generate an appropriate reply
         """
-        if tone not in self.tone_guidelines:
-            tone = 'inviting'  # Default fallback
-            
-        tone_info = self.tone_guidelines[tone]
+        template = self._prompt_templates.get(tone, self._prompt_templates['inviting'])
+        return template.format(comment=comment)
+    
+    def _build_prompt_template(self, tone: str) -> str:
+        """
+        Build the full prompt template for a tone, with a {comment} placeholder.
         
-        # Build the specific prompt based on tone
-        if tone == 'empathetic':
-            tone_specific = f"""
-            The user seems to be experiencing difficulty or struggle. Your reply should:
-            - Acknowledge their feelings without trying to fix everything
-            - Offer gentle spiritual encouragement
-            - Show that you understand their situation
-            - Be {tone_info['style']}
-            """
-            
-        elif tone == 'biblical':
-            tone_specific = f"""
-            The user appears to be seeking understanding or has questions. Your reply should:
-            - Offer spiritual wisdom or insight
-            - Reference spiritual principles naturally (without forcing Bible verses)
-            - Be thoughtful and grounded in faith
-            - Be {tone_info['style']}
-            """
-            
-        elif tone == 'inviting':
-            tone_specific = f"""
-            Your reply should encourage continued conversation and reflection. It should:
-            - Ask a gentle follow-up question or invite further sharing
-            - Be welcoming and open
-            - Create space for dialogue
-            - Be {tone_info['style']}
-            """
-            
-        elif tone == 'humble':
-            tone_specific = f"""
-            The user seems positive or grateful. Your reply should:
-            - Deflect praise appropriately to God or the community
-            - Express gratitude
-            - Be modest about any role you might have played
-            - Be {tone_info['style']}
-            """
+        Args:
+            tone: The tone to build a template for
             
-        elif tone == 'witty':
-            tone_specific = f"""
-            Your reply should bring some lightness while maintaining spiritual depth. It should:
-            - Include gentle, faith-filled humor if appropriate
-            - Be joyful and uplifting
-            - Maintain respect and sensitivity
-            - Be {tone_info['style']}
-            """
-        
-        # Construct the full prompt
-        full_prompt = f"""
-        A user has left this comment: "{comment}"
-        
-        {tone_specific}
-        
-        {self.base_instructions}
-        
-        Generate a reply that is {tone_info['description']} and focuses on {tone_info['focus']}.
-        
-        Reply:
+        Returns:
+            str: The complete prompt template for create_prompt to fill in
         """
-        
-        return full_prompt.strip()
+        tone_info = self.tone_guidelines[tone]
+
+        # The comment leads so the model's KV cache front-loads it; the rest is
+        # a single compact instruction block
+        return (
+            f'"{{comment}}"\n\n'
+            f"Write a 2-3 sentence reply to the comment above. "
+            f"{TONE_INSTRUCTIONS[tone]} "
+            f"Style: {tone_info['style']}. Focus: {tone_info['focus']}.\n"
+            f"{self.base_instructions}"
+        )
     
     def get_tone_examples(self, tone: str) -> dict:
         """
@@ -137,30 +138,7 @@ class PromptGenerator:
         Returns:
             dict: Examples with sample comments and appropriate replies
         """
-        examples = {
-            'empathetic': {
-                'comment': "I'm struggling to believe this applies to me.",
-                'reply': "I hear the struggle in your words, and that's so understandable. Sometimes the most profound truths feel the hardest to accept for ourselves. You're not alone in feeling this way. ❤️"
-            },
-            'biblical': {
-                'comment': "I don't understand why this keeps happening to me.",
-                'reply': "Those 'why' questions can feel so heavy, can't they? Sometimes our greatest growth comes through seasons we never would have chosen. His plans often unfold in ways we can't see in the moment."
-            },
-            'inviting': {
-                'comment': "This really made me think.",
-                'reply': "I love when something sparks that kind of reflection! What part resonated most with you? I'd be curious to hear what thoughts it stirred up."
-            },
-            'humble': {
-                'comment': "Thank you so much for sharing this wisdom!",
-                'reply': "You're so kind! Any wisdom here isn't mine - I'm just grateful when something resonates and encourages someone's heart. That's all God's grace at work. 🙏"
-            },
-            'witty': {
-                'comment': "I needed to hear this today!",
-                'reply': "Isn't it amazing how the right words show up exactly when we need them? Someone upstairs has pretty good timing! 😊 Hope it brings some light to your day."
-            }
-        }
-        
-        return examples.get(tone, {})
+        return TONE_EXAMPLES.get(tone, {})
     
     def validate_tone(self, tone: str) -> bool:
         """
@@ -174,14 +152,14 @@ class PromptGenerator:
         """
         return tone in self.tone_guidelines
     
-    def get_available_tones(self) -> list:
+    def get_available_tones(self) -> tuple:
         """
-        Get list of all available tones.
+        Get all available tones.
         
         Returns:
-            list: List of available tone names
+            tuple: Available tone names, precomputed at init
         """
-        return list(self.tone_guidelines.keys())
+        return self._tones_tuple
     
     def get_tone_description(self, tone: str) -> str:
         """
@@ -197,6 +175,10 @@ class PromptGenerator:
             return self.tone_guidelines[tone]['description']
         return "Tone not found"
 
+# Shared instance: PromptGenerator carries no per-instance state, so reuse
+# this singleton instead of paying re-init per reply
+PROMPT_GEN = PromptGenerator()
+
 # Convenience function for quick prompt generation
 def generate_prompt(comment: str, tone: str = 'inviting') -> str:
     """
@@ -209,8 +191,7 @@ def generate_prompt(comment: str, tone: str = 'inviting') -> str:
     Returns:
         str: Generated prompt
     """
-    generator = PromptGenerator()
-    return generator.create_prompt(comment, tone)
+    return PROMPT_GEN.create_prompt(comment, tone)
 
 if __name__ == "__main__":
     # Quick test of prompt generation
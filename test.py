@@ -5,11 +5,11 @@ Run with: streamlit run test.py
 """
 
 import streamlit as st
+import asyncio
+import json
 import os
-import sys
-from datetime import datetime
+from collections import Counter
 from typing import Dict, Any, List
-import time
 
 # Import our AI system
 try:
@@ -117,20 +117,51 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Initialize session state
-if 'messages' not in st.session_state:
-    st.session_state.messages = []
 if 'ai_system' not in st.session_state:
     st.session_state.ai_system = None
 if 'stats' not in st.session_state:
     st.session_state.stats = {
         'total_messages': 0,
         'successful_replies': 0,
-        'tone_usage': {},
-        'sentiment_distribution': {}
+        'tone_usage': Counter(),
+        'sentiment_distribution': Counter()
     }
 
+# Conversation history is appended to disk instead of growing in
+# st.session_state, and only a window of recent messages is rendered,
+# so long sessions don't accumulate RAM or per-rerun DOM cost
+SESSION_LOG = '.session.jsonl'
+RENDER_WINDOW = 50
+
+def append_message(message: Dict[str, Any]):
+    """Append a chat message to the on-disk session log."""
+    with open(SESSION_LOG, 'a') as f:
+        f.write(json.dumps(message) + '\n')
+
+def load_recent_messages(limit: int = RENDER_WINDOW) -> List[Dict[str, Any]]:
+    """Load the last `limit` messages from the session log."""
+    try:
+        with open(SESSION_LOG) as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return []
+    return [json.loads(line) for line in lines[-limit:]]
+
+def clear_session_log():
+    """Delete the on-disk session log."""
+    try:
+        os.remove(SESSION_LOG)
+    except FileNotFoundError:
+        pass
+
+@st.cache_resource
 def initialize_ai_system():
-    """Initialize the AI system with API key validation."""
+    """
+    Initialize the AI system with API key validation.
+
+    Cached so the OpenAI client is constructed once per process instead of
+    on every Streamlit rerun.
+    """
     try:
         api_key = os.getenv('OPENAI_API_KEY')
         if not api_key:
@@ -141,52 +172,38 @@ def initialize_ai_system():
     except Exception as e:
         return None, f"❌ Error initializing AI system: {str(e)}"
 
+@st.cache_resource
+def get_prompt_generator() -> PromptGenerator:
+    """Build the sidebar's PromptGenerator once per process, not per rerun."""
+    return PromptGenerator()
+
 def update_stats(result: Dict[str, Any]):
     """Update conversation statistics."""
     st.session_state.stats['total_messages'] += 1
     
     if result.get('success'):
         st.session_state.stats['successful_replies'] += 1
-        
-        # Update tone usage
-        tone = result.get('tone_used', 'unknown')
-        st.session_state.stats['tone_usage'][tone] = st.session_state.stats['tone_usage'].get(tone, 0) + 1
-        
-        # Update sentiment distribution
-        sentiment = result.get('sentiment_detected', 'unknown')
-        st.session_state.stats['sentiment_distribution'][sentiment] = st.session_state.stats['sentiment_distribution'].get(sentiment, 0) + 1
+        st.session_state.stats['tone_usage'][result.get('tone_used', 'unknown')] += 1
+        st.session_state.stats['sentiment_distribution'][result.get('sentiment_detected', 'unknown')] += 1
 
 def render_message(message: Dict[str, Any], is_user: bool = True):
-    """Render a chat message with ChatGPT-like styling."""
+    """Render a chat message (st.chat_message is one DOM node per message)."""
     if is_user:
-        st.markdown(f"""
-        <div class="user-message">
-            <strong>👤 You:</strong><br>
-            {message['content']}
-            <div class="message-meta">
-                {message.get('timestamp', '')}
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        with st.chat_message("user"):
+            st.write(message['content'])
+            st.caption(message.get('timestamp', ''))
     else:
         status_icon = "✅" if message.get('success', False) else "❌"
-        reply_text = message.get('reply', 'Error generating reply')
-        
-        st.markdown(f"""
-        <div class="ai-message">
-            <strong>🤖 AI Assistant:</strong><br>
-            {reply_text}
-            <div class="message-meta">
-                {status_icon} Sentiment: {message.get('sentiment', 'N/A')} | 
-                Tone: {message.get('tone', 'N/A')} | 
-                {message.get('timestamp', '')}
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        with st.chat_message("assistant"):
+            st.write(message.get('reply', 'Error generating reply'))
+            st.caption(f"{status_icon} Sentiment: {message.get('sentiment', 'N/A')} | "
+                       f"Tone: {message.get('tone', 'N/A')} | "
+                       f"{message.get('timestamp', '')}")
 
 def main():
     """Main Streamlit application."""
-    
+    from datetime import datetime
+
     # Header
     st.title("🤖 AI Comment Reply Tester")
     st.markdown("**ChatGPT-like Interface for Testing Spiritual AI Responses**")
@@ -214,12 +231,12 @@ def main():
         
         # Clear conversation
         if st.button("🗑️ Clear Conversation", type="secondary"):
-            st.session_state.messages = []
+            clear_session_log()
             st.session_state.stats = {
                 'total_messages': 0,
                 'successful_replies': 0,
-                'tone_usage': {},
-                'sentiment_distribution': {}
+                'tone_usage': Counter(),
+                'sentiment_distribution': Counter()
             }
             st.rerun()
         
@@ -235,7 +252,7 @@ def main():
         
         # Available tones
         st.subheader("🎭 Available Tones")
-        prompt_gen = PromptGenerator()
+        prompt_gen = get_prompt_generator()
         available_tones = prompt_gen.get_available_tones()
         for tone in available_tones:
             description = prompt_gen.get_tone_description(tone)
@@ -270,26 +287,21 @@ def main():
     # Main chat interface
     st.markdown('<div class="chat-container">', unsafe_allow_html=True)
     
-    # Display conversation history
-    if st.session_state.messages:
-        for i, message in enumerate(st.session_state.messages):
-            if message['type'] == 'user':
-                render_message(message, is_user=True)
-            else:
-                render_message(message, is_user=False)
+    # Display the recent window of conversation history
+    messages = load_recent_messages()
+    if messages:
+        for message in messages:
+            render_message(message, is_user=(message['type'] == 'user'))
     else:
         # Welcome message
-        st.markdown("""
-        <div class="ai-message">
-            <strong>🤖 AI Assistant:</strong><br>
-            Hello! I'm your AI comment reply assistant. I specialize in generating empathetic, 
-            spiritual responses to comments. Try sending me a comment to see how I respond!
-            
-            <div class="message-meta">
-                💡 Tip: I can detect sentiment and adjust my tone accordingly (empathetic, biblical, humble, inviting, witty)
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        with st.chat_message("assistant"):
+            st.write(
+                "Hello! I'm your AI comment reply assistant. I specialize in generating "
+                "empathetic, spiritual responses to comments. Try sending me a comment "
+                "to see how I respond!"
+            )
+            st.caption("💡 Tip: I can detect sentiment and adjust my tone accordingly "
+                       "(empathetic, biblical, humble, inviting, witty)")
     
     # Input area
     st.markdown("---")
@@ -323,25 +335,44 @@ def main():
             'content': user_input.strip(),
             'timestamp': datetime.now().strftime("%H:%M:%S")
         }
-        st.session_state.messages.append(user_message)
-        
-        # Show typing indicator
-        typing_placeholder = st.empty()
-        typing_placeholder.markdown(
-            '<div class="typing-indicator">🤖 AI is thinking...</div>',
-            unsafe_allow_html=True
-        )
-        
+        append_message(user_message)
+        render_message(user_message, is_user=True)
+
+        # Placeholder that fills with the reply as tokens stream in
+        with st.chat_message("assistant"):
+            typing_placeholder = st.empty()
+        typing_placeholder.markdown("🤖 *AI is thinking...*")
+
         # Generate AI response
         try:
             custom_tone = None if tone_override == "Auto" else tone_override.lower()
-            
-            with st.spinner("Generating response..."):
-                result = st.session_state.ai_system.generate_reply(
-                    user_input.strip(),
-                    custom_tone
-                )
-            
+            ai_system = st.session_state.ai_system
+            comment = user_input.strip()
+
+            # Sentiment/tone are computed up front so the metadata is available
+            # even though the reply itself streams in
+            sentiment = ai_system.analyze_comment_sentiment(comment)
+            tone = custom_tone or ai_system.determine_tone(sentiment)
+
+            # Stream tokens into the placeholder so the user sees progress
+            # immediately instead of a blank wait for the full response
+            async def collect_stream():
+                text = ""
+                async for token in ai_system.stream_reply(comment, custom_tone):
+                    text += token
+                    typing_placeholder.markdown(text + "▌")
+                return text
+
+            reply_text = asyncio.run(collect_stream())
+
+            result = {
+                'reply': reply_text,
+                'sentiment_detected': sentiment,
+                'tone_used': tone,
+                'success': bool(reply_text),
+                'error': None if reply_text else 'Empty response from API'
+            }
+
             # Remove typing indicator
             typing_placeholder.empty()
             
@@ -355,8 +386,8 @@ def main():
                 'error': result.get('error'),
                 'timestamp': datetime.now().strftime("%H:%M:%S")
             }
-            st.session_state.messages.append(ai_message)
-            
+            append_message(ai_message)
+
             # Update statistics
             update_stats(result)
             
@@ -374,7 +405,7 @@ def main():
                 'error': str(e),
                 'timestamp': datetime.now().strftime("%H:%M:%S")
             }
-            st.session_state.messages.append(error_message)
+            append_message(error_message)
         
         # Clear input and rerun to show new messages
         st.rerun()